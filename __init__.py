@@ -3,12 +3,15 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import (
@@ -20,6 +23,9 @@ from .const import (
     CONF_REGISTRATION_ID,
     CONF_VISITOR_ID,
     CONF_CLIENT_ID,
+    DEFAULT_SCAN_INTERVAL,
+    MAX_SCAN_INTERVAL,
+    REFRESH_COOLDOWN,
 )
 from .spa import BestwaySpa
 
@@ -37,15 +43,48 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         registration_id=entry.data[CONF_REGISTRATION_ID],
         visitor_id=entry.data[CONF_VISITOR_ID],
         client_id=entry.data[CONF_CLIENT_ID],
+        session=async_get_clientsession(hass),
     )
+    # Settle pending commands on unload or if any later setup step fails
+    entry.async_on_unload(spa.close)
+
+    # Copy of the last fetched state. coordinator.data can't be used for the
+    # comparison because entities update it optimistically after commands.
+    last_fetched: Optional[Dict[str, Any]] = None
+
+    async def async_update_data() -> Dict[str, Any]:
+        """Fetch the spa state, backing off while nothing changes."""
+        nonlocal last_fetched
+        data = await spa.get_state()
+        unchanged = last_fetched is not None and data == last_fetched
+        last_fetched = dict(data)
+        if unchanged:
+            coordinator.update_interval = min(
+                coordinator.update_interval * 2,
+                timedelta(seconds=MAX_SCAN_INTERVAL),
+            )
+        else:
+            coordinator.update_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+        return data
 
     coordinator = DataUpdateCoordinator(
         hass,
         _LOGGER,
         name="Bestway Spa",
-        update_method=spa.get_state,
-        update_interval=timedelta(seconds=30),
+        update_method=async_update_data,
+        update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+    )
+
+    # Refreshes after commands wait for the cloud to apply the change and
+    # are coalesced; manual refreshes still go through the coordinator
+    command_refresh = Debouncer(
+        hass,
+        _LOGGER,
+        cooldown=REFRESH_COOLDOWN,
+        immediate=False,
+        function=coordinator.async_refresh,
     )
+    entry.async_on_unload(command_refresh.async_shutdown)
 
     await coordinator.async_config_entry_first_refresh()
 
@@ -56,6 +95,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "spa": spa,
+        "command_refresh": command_refresh,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -1,7 +1,6 @@
 """Climate entity for Bestway Spa."""
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any, Dict, Optional
 
@@ -18,6 +17,7 @@ from homeassistant.const import (
     UnitOfTemperature,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
@@ -36,6 +36,16 @@ from .spa import BestwaySpa
 
 _LOGGER = logging.getLogger(__name__)
 
+_HEATER_MODE = {
+    HEATER_STATE_HEATING: "heating",
+    HEATER_STATE_PASSIVE: "idle",
+}
+
+_HEATER_ACTION = {
+    HEATER_STATE_HEATING: HVACAction.HEATING,
+    HEATER_STATE_PASSIVE: HVACAction.IDLE,
+}
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -44,7 +54,8 @@ async def async_setup_entry(
     """Set up the Bestway Spa climate entity."""
     spa: BestwaySpa = hass.data[DOMAIN][entry.entry_id]["spa"]
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    async_add_entities([BestwaySpaClimate(spa, coordinator)])
+    command_refresh = hass.data[DOMAIN][entry.entry_id]["command_refresh"]
+    async_add_entities([BestwaySpaClimate(spa, coordinator, command_refresh)])
 
 class BestwaySpaClimate(CoordinatorEntity, ClimateEntity):
     """Representation of a Bestway Spa climate entity."""
@@ -53,10 +64,12 @@ class BestwaySpaClimate(CoordinatorEntity, ClimateEntity):
         self,
         spa: BestwaySpa,
         coordinator: DataUpdateCoordinator,
+        command_refresh: Debouncer,
     ) -> None:
         """Initialize the climate entity."""
         super().__init__(coordinator)
         self._spa = spa
+        self._command_refresh = command_refresh
         self._attr_name = "Bestway Spa"
         self._attr_unique_id = f"{spa._device_id}_climate"
         self._attr_temperature_unit = UnitOfTemperature.CELSIUS
@@ -101,11 +114,7 @@ class BestwaySpaClimate(CoordinatorEntity, ClimateEntity):
             return HVACAction.OFF
         
         heater_state = self.coordinator.data.get("heater_state", 0)
-        if heater_state == HEATER_STATE_HEATING:
-            return HVACAction.HEATING
-        elif heater_state == HEATER_STATE_PASSIVE:
-            return HVACAction.IDLE
-        return HVACAction.OFF
+        return _HEATER_ACTION.get(heater_state, HVACAction.OFF)
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
@@ -113,25 +122,10 @@ class BestwaySpaClimate(CoordinatorEntity, ClimateEntity):
         if not self.coordinator.data:
             return {"mode": "off", "error_code": None}
         
-        # Get error code if present
-        error_code = self.coordinator.data.get("error_code")
-        _LOGGER.debug("Error code from response: %s", error_code)
-        
-        # Get heater state
         heater_state = self.coordinator.data.get("heater_state", 0)
-        _LOGGER.debug("Current heater state: %s", heater_state)
-        
-        if heater_state == HEATER_STATE_HEATING:
-            mode = "heating"
-        elif heater_state == HEATER_STATE_PASSIVE:
-            mode = "idle"
-        else:
-            mode = "off"
-            
-        _LOGGER.debug("Setting mode attribute to: %s", mode)
         return {
-            "mode": mode,
-            "error_code": error_code
+            "mode": _HEATER_MODE.get(heater_state, "off"),
+            "error_code": self.coordinator.data.get("error_code"),
         }
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
@@ -139,23 +133,20 @@ class BestwaySpaClimate(CoordinatorEntity, ClimateEntity):
         if ATTR_TEMPERATURE in kwargs:
             await self._spa.set_state("temperature_setting", int(kwargs[ATTR_TEMPERATURE]))
             # Optimistically update our local state
-            self.coordinator.data["temperature_setting"] = int(kwargs[ATTR_TEMPERATURE])
+            if self.coordinator.data is not None:
+                self.coordinator.data["temperature_setting"] = int(kwargs[ATTR_TEMPERATURE])
             self.async_write_ha_state()
-            # Wait 5 seconds before refreshing
-            await asyncio.sleep(5)
-        await self.coordinator.async_request_refresh()
+        await self._command_refresh.async_call()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set the HVAC mode."""
         if hvac_mode == HVACMode.HEAT:
-            await self._spa.set_state("heater_state", HEATER_STATE_HEATING)
-            # Optimistically update our local state
-            self.coordinator.data["heater_state"] = HEATER_STATE_HEATING
+            heater_state = HEATER_STATE_HEATING
         else:
-            await self._spa.set_state("heater_state", HEATER_STATE_OFF)
-            # Optimistically update our local state
-            self.coordinator.data["heater_state"] = HEATER_STATE_OFF
+            heater_state = HEATER_STATE_OFF
+        await self._spa.set_state("heater_state", heater_state)
+        # Optimistically update our local state
+        if self.coordinator.data is not None:
+            self.coordinator.data["heater_state"] = heater_state
         self.async_write_ha_state()
-        # Wait 5 seconds before refreshing
-        await asyncio.sleep(5)
-        await self.coordinator.async_request_refresh() 
\ No newline at end of file
+        await self._command_refresh.async_call()
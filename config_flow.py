@@ -9,6 +9,7 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     DOMAIN,
@@ -45,7 +46,10 @@ class BestwaySpaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     registration_id=user_input[CONF_REGISTRATION_ID],
                     visitor_id=user_input[CONF_VISITOR_ID],
                     client_id=user_input[CONF_CLIENT_ID],
+                    session=async_get_clientsession(self.hass),
                 )
+                # Fetching the state checks the device and product IDs as
+                # well as the app credentials
                 await spa.get_state()
             except Exception as err:
                 _LOGGER.error("Error connecting to Bestway Spa: %s", err)
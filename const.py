@@ -13,12 +13,26 @@ CONF_CLIENT_ID = "client_id"
 # Default values
 DEFAULT_NAME = "Bestway Spa"
 
+# Polling intervals, in seconds
+DEFAULT_SCAN_INTERVAL = 30
+MAX_SCAN_INTERVAL = 300
+
+# Delay before a refresh requested after a command, giving the cloud time
+# to apply the change; also coalesces back-to-back requests. In seconds
+REFRESH_COOLDOWN = 5.0
+
 # API endpoints
 API_BASE_URL = "https://smarthub-eu.bestwaycorp.com/api"
 API_VISITOR_ENDPOINT = f"{API_BASE_URL}/enduser/visitor"
 API_THING_SHADOW_ENDPOINT = f"{API_BASE_URL}/device/thing_shadow"
 API_COMMAND_ENDPOINT = f"{API_BASE_URL}/device/command"
 
+# How long signed auth headers may be reused, in seconds
+AUTH_HEADERS_MAX_AGE = 30
+
+# Window for merging rapid writes into a single command, in seconds
+COMMAND_DEBOUNCE_SECONDS = 0.2
+
 # Heater states
 HEATER_STATE_OFF = 0
 HEATER_STATE_HEATING = 2
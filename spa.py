@@ -1,22 +1,23 @@
 """Bestway Spa API client."""
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import json
 import logging
-import random
-import string
+import secrets
 import time
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set, Tuple
 
 import aiohttp
 import async_timeout
+import orjson
 
 from .const import (
     API_VISITOR_ENDPOINT,
     API_THING_SHADOW_ENDPOINT,
     API_COMMAND_ENDPOINT,
+    AUTH_HEADERS_MAX_AGE,
+    COMMAND_DEBOUNCE_SECONDS,
     HEATER_STATE_OFF,
     HEATER_STATE_HEATING,
     HEATER_STATE_PASSIVE,
@@ -27,6 +28,28 @@ _LOGGER = logging.getLogger(__name__)
 class BestwaySpa:
     """Bestway Spa API client."""
 
+    __slots__ = (
+        "_appid",
+        "_appsecret",
+        "_device_id",
+        "_product_id",
+        "_registration_id",
+        "_visitor_id",
+        "_client_id",
+        "_token",
+        "_token_expires_at",
+        "_token_lock",
+        "_visitor_payload_bytes",
+        "_state_payload_bytes",
+        "_timeout",
+        "_header_cache",
+        "_pending_desired",
+        "_flush_task",
+        "_flush_tasks",
+        "_send_lock",
+        "_session",
+    )
+
     def __init__(
         self,
         appid: str,
@@ -36,6 +59,7 @@ class BestwaySpa:
         registration_id: str,
         visitor_id: str,
         client_id: str,
+        session: aiohttp.ClientSession,
     ) -> None:
         """Initialize the Bestway Spa client."""
         self._appid = appid
@@ -46,14 +70,38 @@ class BestwaySpa:
         self._visitor_id = visitor_id
         self._client_id = client_id
         self._token = None
-        self._token_expires_at = None
-        self._session = None
+        self._token_expires_at: Optional[float] = None
+        self._token_lock = asyncio.Lock()
+        # The visitor and state request bodies never change, so serialize
+        # them once up front
+        self._visitor_payload_bytes = orjson.dumps({
+            "app_id": appid,
+            "brand": "",
+            "client_id": client_id,
+            "lan_code": "en",
+            "location": "GB",
+            "marketing_notification": 0,
+            "push_type": "android",
+            "registration_id": registration_id,
+            "timezone": "GMT",
+            "visitor_id": visitor_id
+        })
+        self._state_payload_bytes = orjson.dumps({
+            "device_id": device_id,
+            "product_id": product_id
+        })
+        self._timeout = aiohttp.ClientTimeout(total=15, connect=5)
+        self._header_cache: Optional[Tuple[float, Optional[str], Dict[str, str]]] = None
+        self._pending_desired: Dict[str, int] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._send_lock = asyncio.Lock()
+        self._session = session
 
     @staticmethod
     def _get_random_nonce(n: int) -> str:
         """Generate a random nonce."""
-        chars = string.ascii_lowercase + string.digits
-        return ''.join(random.choices(chars, k=n))
+        return secrets.token_hex(n // 2)
 
     @staticmethod
     def _md5_of_string(input_string: str) -> str:
@@ -61,9 +109,19 @@ class BestwaySpa:
         return hashlib.md5(input_string.encode('utf-8')).hexdigest()
 
     def _generate_auth_headers(self, token: Optional[str] = None) -> Dict[str, str]:
-        """Generate authentication headers."""
+        """Generate authentication headers.
+
+        The signed headers are reused for a short while so that bursts of
+        requests don't each pay for a fresh nonce and MD5 signature.
+        """
+        now = time.time()
+        if self._header_cache is not None:
+            cached_at, cached_token, cached_headers = self._header_cache
+            if cached_token == token and now - cached_at < AUTH_HEADERS_MAX_AGE:
+                return dict(cached_headers)
+
         nonce = self._get_random_nonce(32)
-        ts = str(int(time.time()))
+        ts = str(int(now))
         string_to_hash = self._appid + self._appsecret + nonce + ts
         sign = self._md5_of_string(string_to_hash).upper()
         
@@ -83,172 +141,154 @@ class BestwaySpa:
         if token:
             headers['Authorization'] = f'token {token}'
         
-        return headers
+        self._header_cache = (now, token, headers)
+        return dict(headers)
 
-    async def _get_token(self) -> str:
-        """Get or refresh the authentication token."""
-        if (
+    def _has_valid_token(self) -> bool:
+        """Return whether the cached token is usable for at least another minute."""
+        return bool(
             self._token
             and self._token_expires_at
-            and datetime.now() < self._token_expires_at
-        ):
+            and time.monotonic() < self._token_expires_at - 60
+        )
+
+    async def _get_token(self) -> str:
+        """Get or refresh the authentication token."""
+        if self._has_valid_token():
             return self._token
 
-        headers = self._generate_auth_headers()
-        payload = {
-            "app_id": self._appid,
-            "brand": "",
-            "client_id": self._client_id,
-            "lan_code": "en",
-            "location": "GB",
-            "marketing_notification": 0,
-            "push_type": "android",
-            "registration_id": self._registration_id,
-            "timezone": "GMT",
-            "visitor_id": self._visitor_id
-        }
+        async with self._token_lock:
+            # Another caller may have refreshed the token while we waited
+            if self._has_valid_token():
+                return self._token
 
-        async with self._session.post(
-            API_VISITOR_ENDPOINT,
-            headers=headers,
-            json=payload,
-            ssl=False
-        ) as response:
-            if response.status != 200:
-                raise Exception("Failed to obtain token")
+            headers = self._generate_auth_headers()
 
-            data = await response.json()
-            token = data.get('data', {}).get('token')
-            if not token:
-                raise Exception("No token in response")
+            async with self._session.post(
+                API_VISITOR_ENDPOINT,
+                headers=headers,
+                data=self._visitor_payload_bytes,
+                ssl=False,
+                timeout=self._timeout,
+            ) as response:
+                if response.status != 200:
+                    raise Exception("Failed to obtain token")
 
-            self._token = token
-            self._token_expires_at = datetime.now() + timedelta(hours=23)
-            return token
+                data = orjson.loads(await response.read())
+                token = data.get('data', {}).get('token')
+                if not token:
+                    raise Exception("No token in response")
 
-    async def get_state(self) -> Dict[str, Any]:
-        """Get the current state of the spa."""
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-
-        token = await self._get_token()
-        headers = self._generate_auth_headers(token)
-        payload = {
-            "device_id": self._device_id,
-            "product_id": self._product_id
-        }
+                self._token = token
+                self._token_expires_at = time.monotonic() + 23 * 3600
+                return token
+
+    async def _post_with_reauth(self, url: str, body: bytes) -> Dict[str, Any]:
+        """POST to the API, refreshing the token once if it is rejected."""
+        for _ in range(2):
+            token = await self._get_token()
+            headers = self._generate_auth_headers(token)
+            async with self._session.post(
+                url,
+                headers=headers,
+                data=body,
+                ssl=False,
+                timeout=self._timeout,
+            ) as response:
+                raw = await response.read()
 
-        async with self._session.post(
-            API_THING_SHADOW_ENDPOINT,
-            headers=headers,
-            json=payload,
-            ssl=False
-        ) as response:
             if response.status != 200:
-                raise Exception("Failed to get spa state")
+                response_text = raw.decode(errors="replace")
+                _LOGGER.error("Request to %s failed. Status: %d, Response: %s", url, response.status, response_text)
+                raise Exception(f"Request to {url} failed. Status: {response.status}, Response: {response_text}")
+
+            try:
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError as e:
+                _LOGGER.error("Failed to parse response as JSON: %s", str(e))
+                raise Exception(f"Invalid JSON response: {raw.decode(errors='replace')}")
+
+            if data.get('code') != 10001:
+                return data
 
-            data = await response.json()
-            if data.get('code') == 10001:
-                # Token is not authorized, refresh and retry
+            # Token is not authorized, refresh and retry unless another
+            # caller has already replaced it
+            if self._token == token:
                 self._token = None
-                token = await self._get_token()
-                headers = self._generate_auth_headers(token)
-                async with self._session.post(
-                    API_THING_SHADOW_ENDPOINT,
-                    headers=headers,
-                    json=payload,
-                    ssl=False
-                ) as retry_response:
-                    if retry_response.status != 200:
-                        raise Exception("Failed to get spa state after token refresh")
-                    data = await retry_response.json()
-
-            if 'data' not in data:
-                raise Exception("Invalid response format")
 
+        raise Exception(f"Request to {url} not authorized after token refresh")
+
+    async def get_state(self) -> Dict[str, Any]:
+        """Get the current state of the spa."""
+        data = await self._post_with_reauth(
+            API_THING_SHADOW_ENDPOINT, self._state_payload_bytes
+        )
+        if 'data' not in data:
+            raise Exception("Invalid response format")
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug("Spa state response: %s", data['data'])
-            return data['data']
+        return data['data']
 
     async def set_state(self, state: str, value: int) -> Dict[str, Any]:
-        """Set the state of the spa."""
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        """Set the state of the spa.
 
-        try:
-            # Get current state first
-            current_state = await self.get_state()
-            _LOGGER.debug("Current state before update: %s", current_state)
+        Writes made within a short debounce window are merged and sent
+        to the API as a single command.
+        """
+        self._pending_desired[state] = value
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(
+                self._flush_after(COMMAND_DEBOUNCE_SECONDS)
+            )
+            self._flush_tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(self._flush_tasks.discard)
+        return await asyncio.shield(self._flush_task)
 
-            token = await self._get_token()
-            headers = self._generate_auth_headers(token)
-            
+    async def _flush_after(self, delay: float) -> Dict[str, Any]:
+        """Send all pending writes as one command once the window closes."""
+        await asyncio.sleep(delay)
+        desired = self._pending_desired
+        self._pending_desired = {}
+        self._flush_task = None
+
+        try:
             # Update the state with the correct payload structure
             payload = {
                 "device_id": self._device_id,
                 "product_id": self._product_id,
-                "desired": json.dumps({
+                "desired": orjson.dumps({
                     "state": {
-                        "desired": {
-                            state: value
-                        }
+                        "desired": desired
                     }
-                })
+                }).decode()
             }
             
-            _LOGGER.debug("Setting state %s to %s with payload: %s", state, value, payload)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Setting state %s with payload: %s", desired, payload)
 
-            async with self._session.post(
-                API_COMMAND_ENDPOINT,
-                headers=headers,
-                json=payload,
-                ssl=False
-            ) as response:
-                response_text = await response.text()
-                _LOGGER.debug("Raw response: %s", response_text)
-                
-                if response.status != 200:
-                    _LOGGER.error("Failed to control spa state. Status: %d, Response: %s", response.status, response_text)
-                    raise Exception(f"Failed to control spa state. Status: {response.status}, Response: {response_text}")
-
-                try:
-                    data = json.loads(response_text)
-                except json.JSONDecodeError as e:
-                    _LOGGER.error("Failed to parse response as JSON: %s", str(e))
-                    raise Exception(f"Invalid JSON response: {response_text}")
-
-                if data.get('code') == 10001:
-                    # Token is not authorized, refresh and retry
-                    self._token = None
-                    token = await self._get_token()
-                    headers = self._generate_auth_headers(token)
-                    async with self._session.post(
-                        API_COMMAND_ENDPOINT,
-                        headers=headers,
-                        json=payload,
-                        ssl=False
-                    ) as retry_response:
-                        retry_text = await retry_response.text()
-                        _LOGGER.debug("Retry raw response: %s", retry_text)
-                        
-                        if retry_response.status != 200:
-                            _LOGGER.error("Failed to control spa state after token refresh. Status: %d, Response: %s", retry_response.status, retry_text)
-                            raise Exception(f"Failed to control spa state after token refresh. Status: {retry_response.status}, Response: {retry_text}")
-                        
-                        try:
-                            data = json.loads(retry_text)
-                        except json.JSONDecodeError as e:
-                            _LOGGER.error("Failed to parse retry response as JSON: %s", str(e))
-                            raise Exception(f"Invalid JSON response on retry: {retry_text}")
+            # A new batch can open while this one is in flight; send them
+            # one at a time so the cloud applies them in order
+            async with self._send_lock:
+                data = await self._post_with_reauth(
+                    API_COMMAND_ENDPOINT, orjson.dumps(payload)
+                )
 
+            if _LOGGER.isEnabledFor(logging.DEBUG):
                 _LOGGER.debug("State update response: %s", data)
-                return data
+            return data
 
         except Exception as e:
             _LOGGER.error("Error setting state: %s", str(e))
             raise
 
     async def close(self) -> None:
-        """Close the aiohttp session."""
-        if self._session:
-            await self._session.close()
-            self._session = None 
\ No newline at end of file
+        """Stop the client, settling any pending commands."""
+        # Drop a batch that is still waiting for its window to close, but
+        # let commands already being sent finish
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+            self._pending_desired = {}
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)